@@ -5,29 +5,53 @@
 
 import os
 import sys
+import types
 
-# 지원하는 오디오 형식
-SUPPORTED_AUDIO_FORMATS = ['.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg']
+# 지원하는 오디오 형식 (소문자 확장자)
+SUPPORTED_AUDIO_FORMATS = frozenset({'.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg'})
 
-# 지원하는 비디오 형식
-SUPPORTED_VIDEO_FORMATS = ['.mp4', '.avi', '.mkv', '.mov', '.wmv']
+# 지원하는 비디오 형식 (소문자 확장자)
+SUPPORTED_VIDEO_FORMATS = frozenset({'.mp4', '.avi', '.mkv', '.mov', '.wmv'})
 
-# 언어 설정
-LANGUAGES = {
+# 언어 설정 (읽기 전용)
+LANGUAGES = types.MappingProxyType({
     "한국어": "ko-KR",
     "영어": "en-US",
     "자동 감지": None
-}
+})
 
 # FFmpeg 관련 설정
 FFMPEG_CONFIG = {
-    "windows_url": "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip",
+    # 실행 파일만 포함된 경량 빌드 (전체 gpl 빌드는 헤더, 라이브러리, 문서 포함)
+    "windows_url": "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip",
     "chunk_length_ms": 60000,  # 60초 청크
     "sample_rate": 44100,
     "channels": 2,
     "codec": "pcm_s16le"
 }
 
+# 음성 인식 설정
+RECOGNITION_CONFIG = {
+    "max_workers": 4,  # 동시에 보낼 Google 음성 인식 요청 수
+    "encode_workers": 2,  # FLAC 인코딩 스레드 수
+    "pipeline_queue_size": 4,  # 인식 파이프라인 단계 사이에 대기할 수 있는 청크 수
+    "sample_rate": 16000,  # 인식용 PCM 샘플레이트 (모노, 16비트)
+    "sample_width": 2,
+    "min_silence_len": 500,  # 청크를 나눌 무음 구간 최소 길이 (ms)
+    "keep_silence_len": 100,  # 잘라낸 무음 구간 양쪽에 남겨 둘 길이 (ms)
+    "silence_thresh_offset": 16,  # 평균 음량보다 이만큼(dB) 작으면 무음으로 판단
+    "request_timeout": 60,  # 청크 인식 요청 제한 시간 (초)
+    "max_retries": 3,  # 요청 제한(429)이나 서버 오류(5xx) 시 다시 시도할 횟수
+    "retry_backoff": 1.0,  # 다시 시도 전 대기 시간 (초, 시도할 때마다 두 배)
+    "progress_interval": 0.1,  # 진행률 표시 최소 갱신 간격 (초)
+    "use_cloud_speech": False,  # google-cloud-speech와 인증 정보(ADC)를 직접 설정한 경우에만 True로 변경
+    "cloud_max_inline_bytes": 10 * 1024 * 1024,  # Google Cloud Speech 인라인 오디오 최대 크기
+    "cloud_poll_interval": 1.0,  # 장시간 인식 작업 진행률 확인 간격 (초)
+    # 청크 인식 결과 캐시 (같은 파일을 다시 인식할 때 API 요청 생략)
+    "cache_dir": os.path.join(os.path.expanduser("~"), ".cache", "speechtotext", "transcripts"),
+    "cache_max_entries": 5000
+}
+
 # UI 설정
 UI_CONFIG = {
     "window_size": (900, 700),
@@ -39,12 +63,13 @@ UI_CONFIG = {
 # 파일 저장 설정
 SAVE_CONFIG = {
     "auto_save_dir": "speech_to_text",
-    "default_encoding": "utf-8",
-    "fallback_encoding": "cp949"
+    "default_encoding": "utf-8",  # 인코딩할 수 없는 문자(짝 없는 서로게이트)는 '?'로 대체
+    "stream_threshold_chars": 4 * 1024 * 1024,  # 이보다 긴 텍스트는 나누어 인코딩
+    "write_chunk_chars": 1 << 20
 }
 
 # 오디오 처리 설정
 AUDIO_CONFIG = {
     "max_file_size_mb": 500,  # 최대 파일 크기 (MB)
-    "supported_formats": SUPPORTED_AUDIO_FORMATS + SUPPORTED_VIDEO_FORMATS
+    "supported_formats": SUPPORTED_AUDIO_FORMATS | SUPPORTED_VIDEO_FORMATS
 } 
\ No newline at end of file
@@ -5,17 +5,53 @@ FFmpeg 설치 관리자 - 음성 텍스트 변환기
 
 import os
 import sys
-import subprocess
-import tempfile
-import urllib.request
-import zipfile
+import io
+import functools
 import shutil
 import time
-from PyQt5.QtWidgets import QMessageBox, QApplication
+import threading
+import queue
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait
 from config import FFMPEG_CONFIG
 
+# PySide6, urllib3, zipfile 등은 FFmpeg 설치가 필요할 때만 사용하므로
+# 시작 속도를 위해 각 함수 안에서 임포트함
+
+try:
+    from stream_unzip import stream_unzip
+except ImportError:
+    stream_unzip = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# 구간(Range) 병렬 다운로드 연결 수 및 적용 최소 크기 (8 MiB)
+_DOWNLOAD_CONNECTIONS = 4
+_RANGED_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024
+
+# 다운로드 읽기 단위 (1 MiB)
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 진행률 UI 갱신 최소 간격 (초, 10Hz)
+_PROGRESS_INTERVAL = 0.1
+
+# 설치에 필요한 실행 파일 (ZIP 내부 경로 접미사)
+_FFMPEG_BINARIES = ('bin/ffmpeg.exe', 'bin/ffprobe.exe', 'bin/ffplay.exe')
+
+# ZIP을 디스크 대신 메모리에 받기 위한 최소 여유 메모리 (4 GiB)
+_IN_MEMORY_MIN_AVAILABLE = 4 * 1024 ** 3
+
+# 압축 해제 쓰기 단위 (1 MiB) 및 직접 스트리밍할 최소 파일 크기
+_EXTRACT_BUFFER_SIZE = 1 << 20
+_LARGE_MEMBER_SIZE = 64 * 1024
+
 def install_ffmpeg():
     """FFmpeg를 자동으로 설치합니다."""
+    from PySide6.QtWidgets import QMessageBox
+    
     try:
         if sys.platform == "win32":
             return _install_ffmpeg_windows()
@@ -30,77 +66,496 @@ def install_ffmpeg():
         QMessageBox.critical(None, "설치 오류", f"FFmpeg 설치 중 오류가 발생했습니다: {e}")
         return False
 
-def _install_ffmpeg_windows():
-    """Windows에서 FFmpeg를 설치합니다."""
+@functools.lru_cache(maxsize=1)
+def _http():
+    """다운로드용 HTTP 연결 풀을 반환합니다 (재시도 시 연결 재사용, 처음 사용할 때 생성)."""
+    import urllib3
+    return urllib3.PoolManager(maxsize=_DOWNLOAD_CONNECTIONS,
+                               retries=urllib3.Retry(3, backoff_factor=0.3))
+
+def _download_file(url, dest, on_progress=None):
+    """URL의 내용을 큰 단위로 스트리밍하여 저장합니다.
+    
+    dest는 파일 경로 또는 쓰기 가능한 파일 객체(예: io.BytesIO)입니다.
+    진행률 콜백은 최대 10Hz로 제한되며, 완료 시 한 번 더 호출됩니다.
+    """
+    resp = _http().request('GET', url, preload_content=False)
     try:
-        # Windows용 FFmpeg 다운로드 및 설치
-        ffmpeg_url = FFMPEG_CONFIG["windows_url"]
-        temp_dir = tempfile.mkdtemp()
-        zip_path = os.path.join(temp_dir, "ffmpeg.zip")
+        if resp.status >= 400:
+            raise IOError(f"다운로드 실패 (HTTP {resp.status})")
         
-        # 다운로드 진행 상태 표시
-        progress_dialog = QMessageBox()
-        progress_dialog.setWindowTitle("FFmpeg 설치")
-        progress_dialog.setText("FFmpeg 설치 준비 중...")
-        progress_dialog.setStandardButtons(QMessageBox.NoButton)
-        progress_dialog.show()
+        total = int(resp.headers.get('Content-Length', 0))
+        done = 0
+        last_update = 0.0
         
-        def update_progress(block_num, block_size, total_size):
-            if total_size > 0:
-                progress = min(100, int(block_num * block_size * 100 / total_size))
-                progress_dialog.setText(f"FFmpeg 다운로드 중... {progress}%")
-                QApplication.processEvents()
-        
-        # FFmpeg 다운로드
-        urllib.request.urlretrieve(ffmpeg_url, zip_path, update_progress)
-        
-        # 압축 해제
-        progress_dialog.setText("압축 해제 중...")
-        QApplication.processEvents()
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            total_files = len(zip_ref.namelist())
-            for i, file in enumerate(zip_ref.namelist()):
-                zip_ref.extract(file, temp_dir)
-                progress = int((i + 1) * 100 / total_files)
-                progress_dialog.setText(f"압축 해제 중... {progress}%")
-                QApplication.processEvents()
-        
-        # FFmpeg 실행 파일을 시스템 경로에 복사
-        progress_dialog.setText("FFmpeg 설치 중...")
-        QApplication.processEvents()
-        
-        ffmpeg_dir = os.path.join(temp_dir, "ffmpeg-master-latest-win64-gpl", "bin")
-        system_path = os.environ.get('PATH', '')
-        new_path = os.path.join(os.path.expanduser("~"), "ffmpeg", "bin")
+        f = open(dest, 'wb') if isinstance(dest, str) else dest
+        try:
+            for chunk in resp.stream(_DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                done += len(chunk)
+                
+                now = time.monotonic()
+                if on_progress and now - last_update >= _PROGRESS_INTERVAL:
+                    last_update = now
+                    on_progress(done, total)
+        finally:
+            if f is not dest:
+                f.close()
+        
+        if on_progress:
+            on_progress(done, total)
+    finally:
+        resp.release_conn()
+
+def _download_file_ranged(url, dest_path, on_progress=None, n=_DOWNLOAD_CONNECTIONS):
+    """서버가 Range 요청을 지원하면 여러 연결로 구간을 나누어 동시에 다운로드합니다.
+    
+    지원하지 않거나 파일이 작으면 _download_file로 한 번에 받습니다.
+    진행률 콜백은 호출한 스레드에서만, 최대 10Hz로 실행됩니다.
+    """
+    head = _http().request('HEAD', url)
+    total = int(head.headers.get('Content-Length', 0))
+    accepts_ranges = head.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    if head.status >= 400 or not accepts_ranges or total < _RANGED_DOWNLOAD_MIN_SIZE or n <= 1:
+        _download_file(url, dest_path, on_progress)
+        return
+    
+    # 파일 크기를 미리 확보 (각 스레드가 자기 구간에 씀)
+    with open(dest_path, 'wb') as f:
+        f.truncate(total)
+    
+    done = [0]
+    lock = threading.Lock()
+    
+    def fetch_range(start, end):
+        resp = _http().request('GET', url, headers={'Range': f'bytes={start}-{end}'},
+                             preload_content=False)
+        try:
+            if resp.status != 206:
+                raise IOError(f"구간 다운로드 실패 (HTTP {resp.status})")
+            # 스레드마다 별도 파일 핸들을 사용하므로 위치(seek)가 서로 간섭하지 않음
+            with open(dest_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in resp.stream(_DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    with lock:
+                        done[0] += len(chunk)
+        finally:
+            resp.release_conn()
+    
+    part_size = -(-total // n)
+    ranges = [(start, min(start + part_size, total) - 1) for start in range(0, total, part_size)]
+    
+    last_update = 0.0
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(fetch_range, start, end) for start, end in ranges]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=_PROGRESS_INTERVAL)
+            now = time.monotonic()
+            if on_progress and (not pending or now - last_update >= _PROGRESS_INTERVAL):
+                last_update = now
+                with lock:
+                    received = done[0]
+                on_progress(received, total)
+        
+        # 작업 스레드에서 발생한 예외 전달
+        for future in futures:
+            future.result()
+    
+    if done[0] != total:
+        raise IOError(f"다운로드 크기가 맞지 않습니다 ({done[0]}/{total} 바이트)")
+
+def _throttle(callback, interval=_PROGRESS_INTERVAL):
+    """진행률 콜백의 호출 빈도를 제한합니다. 완료 시점(done >= total)은 항상 전달합니다."""
+    last_update = [0.0]
+    
+    def throttled(done, total, *args):
+        now = time.monotonic()
+        if done < total and now - last_update[0] < interval:
+            return
+        last_update[0] = now
+        callback(done, total, *args)
+    
+    return throttled
+
+def _safe_extract_path(dest_root, name):
+    """압축 항목의 대상 경로를 반환합니다. 대상 폴더 밖을 가리키면 None을 반환합니다."""
+    target = os.path.realpath(os.path.join(dest_root, name))
+    if not target.startswith(dest_root + os.sep):
+        return None
+    return target
+
+def _extract_member(zip_ref, info, dest_root):
+    """압축 항목 하나를 해제합니다. 큰 파일은 1 MiB 단위로 직접 씁니다.
+    
+    ZipFile.open으로 끝까지 읽으면 CRC32가 읽는 동안 함께 검증되므로
+    testzip() 같은 별도 검사 없이 한 번의 해제로 무결성을 확인합니다.
+    """
+    import zipfile
+    import zlib
+    
+    target = _safe_extract_path(dest_root, info.filename)
+    if target is None:
+        return
+    
+    try:
+        if info.file_size <= _LARGE_MEMBER_SIZE:
+            zip_ref.extract(info, dest_root)
+        else:
+            with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, _EXTRACT_BUFFER_SIZE)
+    except (zipfile.BadZipFile, zlib.error) as e:
+        # CRC 불일치 등으로 손상된 파일은 남기지 않음
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        raise IOError(f"다운로드한 압축 파일이 손상되었습니다 ({info.filename}): {e}")
+
+def _is_ffmpeg_binary(name):
+    """설치에 필요한 실행 파일인지 확인합니다."""
+    return name.endswith(_FFMPEG_BINARIES)
+
+def _download_and_extract_streaming(url, dest_dir, on_progress=None, include=None):
+    """다운로드와 압축 해제를 동시에 진행합니다 (stream-unzip 필요).
+    
+    네트워크 수신은 별도 스레드에서 진행하고, 호출한 스레드는 도착한
+    데이터를 바로 압축 해제합니다. 진행률 콜백은 (받은 바이트, 전체 바이트,
+    해제된 파일 수)로 호출한 스레드에서만 실행됩니다.
+    include가 주어지면 include(이름)이 참인 파일만 저장합니다.
+    """
+    resp = _http().request('GET', url, preload_content=False)
+    receiver = None
+    stop = threading.Event()
+    try:
+        if resp.status >= 400:
+            raise IOError(f"다운로드 실패 (HTTP {resp.status})")
+        
+        total = int(resp.headers.get('Content-Length', 0))
+        chunk_queue = queue.Queue(maxsize=16)
+        state = {"received": 0, "extracted": 0, "last_update": 0.0}
+        
+        def put(item):
+            # 압축 해제가 중단되면 큐가 비워지지 않으므로 중단 신호를 확인하며 대기
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def receive():
+            try:
+                for chunk in resp.stream(_DOWNLOAD_CHUNK_SIZE):
+                    if not put(chunk):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(None)
+        
+        def report_progress(force=False):
+            now = time.monotonic()
+            if on_progress and (force or now - state["last_update"] >= _PROGRESS_INTERVAL):
+                state["last_update"] = now
+                on_progress(state["received"], total, state["extracted"])
+        
+        def received_chunks():
+            while True:
+                item = chunk_queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                state["received"] += len(item)
+                report_progress()
+                yield item
+        
+        receiver = threading.Thread(target=receive, daemon=True)
+        receiver.start()
+        
+        dest_root = os.path.realpath(dest_dir)
+        for file_name, _, unzipped_chunks in stream_unzip(received_chunks()):
+            name = file_name.decode('utf-8', errors='replace')
+            target = _safe_extract_path(dest_root, name)
+            
+            # 디렉토리, 대상 폴더 밖을 가리키는 항목, 필요 없는 파일은 건너뜀
+            # (stream-unzip은 다음 항목으로 넘어가기 전에 끝까지 읽어야 함)
+            if name.endswith('/') or target is None or (include and not include(name)):
+                for _ in unzipped_chunks:
+                    pass
+                continue
+            
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                for chunk in unzipped_chunks:
+                    f.write(chunk)
+            state["extracted"] += 1
+        
+        receiver.join()
+        report_progress(force=True)
+    finally:
+        # 압축 해제 중 오류가 나면 수신 스레드를 멈추고 끝날 때까지 기다린 뒤 연결 반환
+        stop.set()
+        if receiver is not None and receiver.is_alive():
+            resp.close()  # 네트워크 읽기에서 대기 중인 수신 스레드를 깨움
+            receiver.join()
+        resp.release_conn()
+
+def _has_memory_for_zip():
+    """ZIP을 메모리에서 처리할 만큼 여유 메모리가 있는지 확인합니다."""
+    if not psutil:
+        return False
+    try:
+        return psutil.virtual_memory().available >= _IN_MEMORY_MIN_AVAILABLE
+    except Exception:
+        return False
+
+def _open_zip(zip_source):
+    """ZIP 파일 경로 또는 메모리상의 ZIP 데이터(bytes)를 엽니다."""
+    import zipfile
+    
+    if isinstance(zip_source, bytes):
+        # bytes로 만든 BytesIO는 데이터를 복사하지 않고 공유함
+        return zipfile.ZipFile(io.BytesIO(zip_source), 'r')
+    return zipfile.ZipFile(zip_source, 'r')
+
+def _extract_parallel(zip_source, temp_dir, n=os.cpu_count(), on_progress=None, include=None):
+    """ZIP 파일을 여러 스레드에서 병렬로 압축 해제합니다.
+    
+    zip_source는 ZIP 파일 경로 또는 메모리상의 ZIP 데이터(bytes)입니다.
+    include가 주어지면 include(이름)이 참인 파일만 해제합니다.
+    ZipFile 객체는 스레드 간에 공유할 수 없으므로 스레드마다 별도로 엽니다.
+    진행률 콜백은 항상 호출한 스레드(메인 스레드)에서만 실행됩니다.
+    """
+    with _open_zip(zip_source) as zip_ref:
+        infos = zip_ref.infolist()
+    
+    # 디렉토리는 미리 생성 (여러 스레드가 동시에 makedirs 하는 경합 방지)
+    dest_root = os.path.realpath(temp_dir)
+    files = []
+    for info in infos:
+        # 필터가 있으면 빈 디렉토리는 만들지 않음 (파일의 상위 폴더는 아래에서 생성)
+        if include and (info.is_dir() or not include(info.filename)):
+            continue
+        target = _safe_extract_path(dest_root, info.filename)
+        if target is None:
+            continue
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            files.append(info)
+    
+    # 큰 파일부터 처리 (진행률이 큰 항목에서 멈추지 않고, 스레드 간 부하가 고르게 됨)
+    files.sort(key=lambda info: info.file_size, reverse=True)
+    total = len(files)
+    n = max(1, min(n or 1, total))
+    
+    # 단일 스레드인 경우 순차 처리
+    if n == 1:
+        with _open_zip(zip_source) as zip_ref:
+            for i, info in enumerate(files):
+                _extract_member(zip_ref, zip_ref.getinfo(info.filename), dest_root)
+                if on_progress:
+                    on_progress(i + 1, total)
+        return
+    
+    done = [0]
+    lock = threading.Lock()
+    
+    def extract_chunk(chunk):
+        with _open_zip(zip_source) as zip_ref:
+            for info in chunk:
+                _extract_member(zip_ref, zip_ref.getinfo(info.filename), dest_root)
+                with lock:
+                    done[0] += 1
+    
+    # 큰 파일부터 현재 가장 적게 할당된 스레드에 배정 (LPT 스케줄링)
+    chunks = [[] for _ in range(n)]
+    loads = [(0, i) for i in range(n)]
+    for info in files:
+        load, i = heapq.heappop(loads)
+        chunks[i].append(info)
+        heapq.heappush(loads, (load + info.compress_size, i))
+    
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        futures = [executor.submit(extract_chunk, chunk) for chunk in chunks]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.1)
+            if on_progress:
+                with lock:
+                    count = done[0]
+                on_progress(count, total)
         
-        # FFmpeg 폴더 생성
+        # 작업 스레드에서 발생한 예외 전달
+        for future in futures:
+            future.result()
+
+def _find_extracted_bin_dir(root_dir):
+    """압축 해제된 폴더에서 ffmpeg.exe가 있는 폴더를 찾습니다 (최상위 폴더 이름은 빌드마다 다름)."""
+    for dirpath, _, filenames in os.walk(root_dir):
+        if 'ffmpeg.exe' in filenames:
+            return dirpath
+    raise FileNotFoundError("압축 파일에서 ffmpeg.exe를 찾을 수 없습니다.")
+
+def _add_to_path(new_path):
+    """폴더를 현재 프로세스의 PATH와 Windows 사용자 환경 변수 Path에 추가합니다."""
+    from utils import normalize_path_entry, prepend_to_process_path
+    
+    prepend_to_process_path(new_path)
+    
+    # 재시작 후에도 유지되도록 사용자 환경 변수에 저장
+    import winreg
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment", 0,
+                            winreg.KEY_READ | winreg.KEY_WRITE) as reg_key:
+            try:
+                user_path, value_type = winreg.QueryValueEx(reg_key, "Path")
+            except FileNotFoundError:
+                user_path, value_type = "", winreg.REG_EXPAND_SZ
+            
+            key = normalize_path_entry(new_path)
+            user_entries = {normalize_path_entry(os.path.expandvars(p))
+                            for p in user_path.split(os.pathsep) if p}
+            if key not in user_entries:
+                updated = f"{user_path}{os.pathsep}{new_path}" if user_path else new_path
+                winreg.SetValueEx(reg_key, "Path", 0, value_type, updated)
+    except OSError as e:
+        if not getattr(sys, 'frozen', False):
+            print(f"[WARNING] 사용자 환경 변수 Path 저장 실패: {e}")
+
+def _install_ffmpeg_windows_files(ffmpeg_url, on_progress, on_status):
+    """FFmpeg를 내려받아 사용자 폴더에 설치하고 PATH에 추가합니다. GUI를 사용하지 않습니다.
+    
+    on_progress(percent)와 on_status(text)로 진행 상황을 알립니다.
+    """
+    import tempfile
+    
+    @_throttle
+    def report(done, total):
+        on_progress(min(100, int(done * 100 / total)) if total else 0)
+    
+    # 예외가 발생해도 임시 폴더가 정리되도록 컨텍스트 매니저 사용
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if stream_unzip:
+            # 다운로드와 압축 해제를 동시에 진행
+            on_status("FFmpeg 다운로드 및 압축 해제 중...")
+            _download_and_extract_streaming(ffmpeg_url, temp_dir,
+                                            lambda received, total, extracted: report(received, total),
+                                            include=_is_ffmpeg_binary)
+        else:
+            on_status("FFmpeg 다운로드 중...")
+            
+            # FFmpeg 다운로드 (메모리가 충분하면 디스크를 거치지 않음)
+            if _has_memory_for_zip():
+                buffer = io.BytesIO()
+                _download_file(ffmpeg_url, buffer, report)
+                zip_source = buffer.getvalue()
+                del buffer
+            else:
+                zip_source = os.path.join(temp_dir, "ffmpeg.zip")
+                _download_file_ranged(ffmpeg_url, zip_source, report)
+            
+            # 필요한 실행 파일만 해제 (문서, 헤더, 라이브러리 제외)
+            on_status("압축 해제 중...")
+            on_progress(0)
+            _extract_parallel(zip_source, temp_dir, on_progress=report,
+                              include=_is_ffmpeg_binary)
+            del zip_source
+        
+        # FFmpeg 실행 파일을 사용자 폴더로 이동
+        on_status("FFmpeg 설치 중...")
+        on_progress(0)
+        
+        ffmpeg_dir = _find_extracted_bin_dir(temp_dir)
+        new_path = os.path.join(os.path.expanduser("~"), "ffmpeg", "bin")
         os.makedirs(new_path, exist_ok=True)
         
-        # 실행 파일 복사
-        files = [f for f in os.listdir(ffmpeg_dir) if f.endswith('.exe')]
+        # 실행 파일 이동 (같은 파일 시스템이면 이름 변경만으로 처리)
+        with os.scandir(ffmpeg_dir) as it:
+            files = [entry for entry in it if entry.name.endswith('.exe')]
         total_files = len(files)
-        for i, file in enumerate(files):
-            shutil.copy2(os.path.join(ffmpeg_dir, file), new_path)
-            progress = int((i + 1) * 100 / total_files)
-            progress_dialog.setText(f"설치 중... {progress}%")
-            QApplication.processEvents()
+        for i, entry in enumerate(files):
+            dst = os.path.join(new_path, entry.name)
+            try:
+                os.replace(entry.path, dst)
+            except OSError:
+                # 다른 드라이브인 경우 복사 (메타데이터는 불필요)
+                shutil.copyfile(entry.path, dst, follow_symlinks=False)
+            on_progress(int((i + 1) * 100 / total_files))
         
         # 환경 변수 PATH에 추가
-        if new_path not in system_path:
-            os.environ['PATH'] = f"{new_path};{system_path}"
+        _add_to_path(new_path)
         
-        # 임시 파일 정리
-        progress_dialog.setText("임시 파일 정리 중...")
-        QApplication.processEvents()
+        # 임시 파일 정리 (컨텍스트 종료 시)
+        on_status("임시 파일 정리 중...")
+
+@functools.lru_cache(maxsize=1)
+def _install_thread_class():
+    """설치 작업 스레드 클래스를 만듭니다 (Qt는 설치가 필요할 때만 임포트)."""
+    from PySide6.QtCore import QThread, Signal
+    
+    class InstallThread(QThread):
+        """FFmpeg 설치 스레드 - 진행 상황은 시그널로 GUI 스레드에 전달"""
+        progress = Signal(int)
+        status = Signal(str)
+        error = Signal(str)
         
-        shutil.rmtree(temp_dir)
+        def __init__(self, ffmpeg_url):
+            super().__init__()
+            self.ffmpeg_url = ffmpeg_url
+            self.succeeded = False
         
-        progress_dialog.setText("설치 완료!")
-        QApplication.processEvents()
+        def run(self):
+            try:
+                _install_ffmpeg_windows_files(self.ffmpeg_url, self.progress.emit, self.status.emit)
+                self.succeeded = True
+            except Exception as e:
+                self.error.emit(str(e))
+    
+    return InstallThread
+
+def _install_ffmpeg_windows():
+    """Windows에서 FFmpeg를 설치합니다."""
+    from PySide6.QtWidgets import QMessageBox, QProgressDialog
+    from PySide6.QtCore import Qt, QTimer, QEventLoop
+    
+    try:
+        # 다운로드 진행 상태 표시
+        progress_dialog = QProgressDialog("FFmpeg 설치 준비 중...", "", 0, 100)
+        progress_dialog.setWindowTitle("FFmpeg 설치")
+        progress_dialog.setCancelButton(None)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.show()
         
-        time.sleep(1)  # 완료 메시지를 잠시 보여줌
-        progress_dialog.close()
+        # 설치는 작업 스레드에서 진행하고, 끝날 때까지 이벤트 루프를 돌려 대화상자를 갱신
+        errors = []
+        install_thread = _install_thread_class()(FFMPEG_CONFIG["windows_url"])
+        install_thread.progress.connect(progress_dialog.setValue)
+        install_thread.status.connect(progress_dialog.setLabelText)
+        install_thread.error.connect(errors.append)
+        
+        loop = QEventLoop()
+        install_thread.finished.connect(loop.quit)
+        install_thread.start()
+        loop.exec()
+        
+        if not install_thread.succeeded:
+            progress_dialog.close()
+            QMessageBox.critical(None, "설치 오류",
+                                 f"Windows FFmpeg 설치 중 오류: {errors[0] if errors else '알 수 없는 오류'}")
+            return False
+        
+        progress_dialog.setLabelText("설치 완료!")
+        progress_dialog.setValue(100)
+        
+        # 완료 메시지를 잠시 보여준 뒤 닫음 (UI 스레드를 막지 않음)
+        QTimer.singleShot(1000, progress_dialog.close)
         QMessageBox.information(None, "설치 완료", "FFmpeg가 성공적으로 설치되었습니다.")
         return True
         
@@ -108,32 +563,69 @@ def _install_ffmpeg_windows():
         QMessageBox.critical(None, "설치 오류", f"Windows FFmpeg 설치 중 오류: {e}")
         return False
 
+def _run_with_live_output(command, progress_dialog):
+    """명령을 실행하면서 출력의 마지막 줄을 진행 대화상자에 표시합니다.
+    
+    출력 파이프는 QSocketNotifier로 감시하므로 명령이 실행되는 동안에도
+    Qt 이벤트 루프가 계속 돌아갑니다. 종료 코드를 반환합니다.
+    """
+    import subprocess
+    from PySide6.QtCore import QEventLoop, QSocketNotifier
+    
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    fd = proc.stdout.fileno()
+    loop = QEventLoop()
+    notifier = QSocketNotifier(fd, QSocketNotifier.Type.Read)
+    
+    def read_output():
+        data = os.read(fd, 4096)
+        if not data:
+            # EOF: 프로세스 출력 종료
+            notifier.setEnabled(False)
+            loop.quit()
+            return
+        lines = [line.strip() for line in data.decode('utf-8', errors='replace').splitlines()]
+        lines = [line for line in lines if line]
+        if lines:
+            progress_dialog.setLabelText(lines[-1][:120])
+    
+    notifier.activated.connect(read_output)
+    loop.exec()
+    proc.stdout.close()
+    return proc.wait()
+
 def _install_ffmpeg_macos():
     """macOS에서 FFmpeg를 설치합니다."""
+    from PySide6.QtWidgets import QMessageBox, QProgressDialog
+    from PySide6.QtCore import Qt
+    
     try:
-        progress_dialog = QMessageBox()
+        # 진행률을 알 수 없으므로 바쁨 표시(0~0) 사용
+        progress_dialog = QProgressDialog("FFmpeg 설치 중...", "", 0, 0)
         progress_dialog.setWindowTitle("FFmpeg 설치")
-        progress_dialog.setText("FFmpeg 설치 중...")
-        progress_dialog.setStandardButtons(QMessageBox.NoButton)
+        progress_dialog.setCancelButton(None)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
         progress_dialog.show()
         
         try:
-            subprocess.run(['brew', 'install', 'ffmpeg'], check=True)
-            progress_dialog.close()
-            QMessageBox.information(None, "설치 완료", "FFmpeg가 성공적으로 설치되었습니다.")
-            return True
-        except subprocess.CalledProcessError:
-            progress_dialog.close()
-            QMessageBox.critical(None, "설치 실패", 
-                               "Homebrew를 통해 FFmpeg 설치에 실패했습니다.\n"
-                               "Homebrew가 설치되어 있는지 확인하세요.")
-            return False
+            returncode = _run_with_live_output(['brew', 'install', 'ffmpeg'], progress_dialog)
         except FileNotFoundError:
             progress_dialog.close()
             QMessageBox.critical(None, "Homebrew 없음", 
                                "Homebrew가 설치되어 있지 않습니다.\n"
                                "https://brew.sh에서 Homebrew를 설치하세요.")
             return False
+        
+        progress_dialog.close()
+        if returncode != 0:
+            QMessageBox.critical(None, "설치 실패", 
+                               "Homebrew를 통해 FFmpeg 설치에 실패했습니다.\n"
+                               "Homebrew가 설치되어 있는지 확인하세요.")
+            return False
+        
+        QMessageBox.information(None, "설치 완료", "FFmpeg가 성공적으로 설치되었습니다.")
+        return True
             
     except Exception as e:
         QMessageBox.critical(None, "설치 오류", f"macOS FFmpeg 설치 중 오류: {e}")
@@ -141,12 +633,24 @@ def _install_ffmpeg_macos():
 
 def check_and_install_ffmpeg():
     """FFmpeg가 설치되어 있는지 확인하고, 없으면 설치를 시도합니다."""
-    from utils import find_ffmpeg_path
+    from utils import find_ffmpeg_path, find_ffprobe_path
     
-    # FFmpeg 경로 확인
-    ffmpeg_path = find_ffmpeg_path()
-    if ffmpeg_path:
+    # FFmpeg 경로 확인 (결과는 프로세스 안에서 캐시되어 이후 find_ffmpeg_path 호출에서 재사용)
+    # 검색은 shutil.which 몇 번뿐이므로 디스크에 경로를 캐시하지 않음
+    if find_ffmpeg_path():
         return True
+    # 설치 후 다시 검색할 수 있도록 실패 결과는 캐시에서 제거
+    find_ffmpeg_path.cache_clear()
+    find_ffprobe_path.cache_clear()
+    
+    try:
+        from PySide6.QtWidgets import QMessageBox
+    except ImportError:
+        # GUI 없이 실행되는 환경에서는 안내만 출력
+        print("[ERROR] FFmpeg가 설치되어 있지 않습니다. 수동으로 설치하세요:\n"
+              "macOS: brew install ffmpeg\n"
+              "Windows: https://ffmpeg.org/download.html에서 다운로드", file=sys.stderr)
+        return False
     
     # FFmpeg가 없는 경우 설치 여부 확인
     response = QMessageBox.question(None, "FFmpeg 설치 필요", 
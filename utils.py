@@ -5,21 +5,27 @@
 
 import os
 import sys
-import subprocess
+import stat
+import functools
+import socket
 import tempfile
-import urllib.request
 import zipfile
 import shutil
+import threading
 import platform
-import winreg
 import time
 from pathlib import Path
 
+# PyInstaller 등으로 만든 exe 파일로 실행 중인지 여부 (exe에서는 콘솔 출력 생략)
+_FROZEN = bool(getattr(sys, 'frozen', False))
+
+@functools.lru_cache(maxsize=1)
 def get_documents_dir():
-    """사용자의 문서 폴더 경로를 가져옵니다."""
+    """사용자의 문서 폴더 경로를 가져옵니다 (처음 한 번만 조회)."""
     try:
         if sys.platform == "win32":
             try:
+                import winreg  # Windows 전용 모듈이므로 필요할 때만 불러옴
                 with winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
                                   r"Software\Microsoft\Windows\CurrentVersion\Explorer\Shell Folders") as key:
                     return winreg.QueryValueEx(key, "Personal")[0]
@@ -36,78 +42,107 @@ def get_documents_dir():
         print(f"[ERROR] 문서 폴더 경로 가져오기 실패: {e}")
         return os.path.join(os.path.expanduser("~"), "Documents")
 
-def find_ffmpeg_path():
-    """FFmpeg 실행 파일의 경로를 찾습니다."""
-    possible_ffmpeg_paths = [
-        'ffmpeg',  # 기본 PATH
-        '/usr/local/bin/ffmpeg',  # Homebrew 기본 설치 경로
-        '/opt/homebrew/bin/ffmpeg',  # Apple Silicon Homebrew 경로
-        '/usr/bin/ffmpeg',  # 시스템 경로
-        os.path.expanduser('~/bin/ffmpeg'),  # 사용자 bin 디렉토리
-    ]
+def _find_in_user_env_path(exe_name):
+    """Windows 사용자 환경 변수(HKCU\\Environment)의 Path에서 ffmpeg 폴더를 찾습니다."""
+    import winreg
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, "Environment") as key:
+            user_path = winreg.QueryValueEx(key, "Path")[0]
+    except OSError:
+        return None
     
-    # Windows에서 추가 검색 경로
-    if sys.platform == "win32":
-        possible_ffmpeg_paths.extend([
-            os.path.join(os.environ.get('ProgramFiles', 'C:\\Program Files'), 'FFmpeg', 'bin', 'ffmpeg.exe'),
-            os.path.join(os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'), 'FFmpeg', 'bin', 'ffmpeg.exe'),
-            os.path.join(os.path.expanduser('~'), 'ffmpeg', 'bin', 'ffmpeg.exe'),
-        ])
+    for entry in os.path.expandvars(user_path).split(os.pathsep):
+        if 'ffmpeg' in entry.lower() and os.path.basename(entry.rstrip('\\/')).lower() == 'bin':
+            candidate = os.path.join(entry, exe_name)
+            if os.access(candidate, os.X_OK):
+                return candidate
+    return None
+
+def _find_executable(name, candidates):
+    """후보 경로 중 실행 가능한 첫 번째 파일을 찾습니다 (프로세스 실행 없이 검사)."""
+    for candidate in candidates:
+        # shutil.which는 이름이면 PATH를, 경로면 해당 파일을 검사
+        path = shutil.which(candidate)
+        if path:
+            return path
     
-    # 각 경로 시도
-    for ffmpeg_path in possible_ffmpeg_paths:
-        try:
-            subprocess.run([ffmpeg_path, '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-            # exe 파일이 아닌 경우에만 출력
-            if not getattr(sys, 'frozen', False):
-                print(f"FFmpeg found at: {ffmpeg_path}")
-            # 찾은 경로를 환경 변수에 추가
-            ffmpeg_dir = os.path.dirname(ffmpeg_path)
-            if ffmpeg_dir and ffmpeg_dir not in os.environ.get('PATH', ''):
-                os.environ['PATH'] = f"{ffmpeg_dir}{os.pathsep}{os.environ.get('PATH', '')}"
-            return ffmpeg_path
-        except (subprocess.SubprocessError, FileNotFoundError):
-            continue
+    # Windows에서는 사용자 환경 변수의 Path도 확인 (현재 프로세스에 반영되지 않았을 수 있음)
+    if sys.platform == "win32":
+        return _find_in_user_env_path(f"{name}.exe")
     
     return None
 
-def find_ffprobe_path():
-    """FFprobe 실행 파일의 경로를 찾습니다."""
-    possible_ffprobe_paths = [
-        'ffprobe',  # 기본 PATH
-        '/usr/local/bin/ffprobe',  # Homebrew 기본 설치 경로
-        '/opt/homebrew/bin/ffprobe',  # Apple Silicon Homebrew 경로
-        '/usr/bin/ffprobe',  # 시스템 경로
-        os.path.expanduser('~/bin/ffprobe'),  # 사용자 bin 디렉토리
+def normalize_path_entry(path):
+    """PATH 항목 비교를 위해 경로를 정규화합니다 (대소문자, 구분자, 끝 슬래시)."""
+    return os.path.normcase(os.path.normpath(path))
+
+def prepend_to_process_path(directory):
+    """폴더가 현재 프로세스의 PATH에 없으면 맨 앞에 추가합니다.
+    
+    부분 문자열이 아니라 정규화한 항목 단위로 비교합니다.
+    """
+    system_path = os.environ.get('PATH', '')
+    key = normalize_path_entry(directory)
+    if all(normalize_path_entry(p) != key for p in system_path.split(os.pathsep) if p):
+        os.environ['PATH'] = f"{directory}{os.pathsep}{system_path}"
+
+def _executable_candidates(name):
+    """실행 파일을 찾을 후보 경로 목록을 만듭니다."""
+    candidates = [
+        name,  # 기본 PATH
+        f'/usr/local/bin/{name}',  # Homebrew 기본 설치 경로
+        f'/opt/homebrew/bin/{name}',  # Apple Silicon Homebrew 경로
+        f'/usr/bin/{name}',  # 시스템 경로
+        os.path.expanduser(f'~/bin/{name}'),  # 사용자 bin 디렉토리
     ]
     
     # Windows에서 추가 검색 경로
     if sys.platform == "win32":
-        possible_ffprobe_paths.extend([
-            os.path.join(os.environ.get('ProgramFiles', 'C:\\Program Files'), 'FFmpeg', 'bin', 'ffprobe.exe'),
-            os.path.join(os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'), 'FFmpeg', 'bin', 'ffprobe.exe'),
-            os.path.join(os.path.expanduser('~'), 'ffmpeg', 'bin', 'ffprobe.exe'),
+        candidates.extend([
+            os.path.join(os.environ.get('ProgramFiles', 'C:\\Program Files'), 'FFmpeg', 'bin', f'{name}.exe'),
+            os.path.join(os.environ.get('ProgramFiles(x86)', 'C:\\Program Files (x86)'), 'FFmpeg', 'bin', f'{name}.exe'),
+            os.path.join(os.path.expanduser('~'), 'ffmpeg', 'bin', f'{name}.exe'),
         ])
     
-    # 각 경로 시도
-    for ffprobe_path in possible_ffprobe_paths:
-        try:
-            subprocess.run([ffprobe_path, '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-            # exe 파일이 아닌 경우에만 출력
-            if not getattr(sys, 'frozen', False):
-                print(f"FFprobe found at: {ffprobe_path}")
-            return ffprobe_path
-        except (subprocess.SubprocessError, FileNotFoundError):
-            continue
+    return tuple(candidates)
+
+# 후보 경로는 실행 중 바뀌지 않으므로 모듈을 불러올 때 한 번만 계산
+_FFMPEG_CANDIDATES = _executable_candidates('ffmpeg')
+_FFPROBE_CANDIDATES = _executable_candidates('ffprobe')
+
+@functools.lru_cache(maxsize=1)
+def find_ffmpeg_path():
+    """FFmpeg 실행 파일의 경로를 찾습니다. 결과는 캐시되며, 설치 후에는 cache_clear()로 다시 검색합니다."""
+    ffmpeg_path = _find_executable('ffmpeg', _FFMPEG_CANDIDATES)
+    if ffmpeg_path:
+        # exe 파일이 아닌 경우에만 출력
+        if not _FROZEN:
+            print(f"FFmpeg found at: {ffmpeg_path}")
+        # 찾은 경로를 환경 변수에 추가
+        ffmpeg_dir = os.path.dirname(ffmpeg_path)
+        if ffmpeg_dir:
+            prepend_to_process_path(ffmpeg_dir)
     
-    return None
+    return ffmpeg_path
+
+@functools.lru_cache(maxsize=1)
+def find_ffprobe_path():
+    """FFprobe 실행 파일의 경로를 찾습니다. 결과는 캐시됩니다."""
+    ffprobe_path = _find_executable('ffprobe', _FFPROBE_CANDIDATES)
+    if ffprobe_path:
+        # exe 파일이 아닌 경우에만 출력
+        if not _FROZEN:
+            print(f"FFprobe found at: {ffprobe_path}")
+    
+    return ffprobe_path
 
 def check_internet_connection():
     """인터넷 연결을 확인합니다."""
     try:
-        urllib.request.urlopen('http://google.com', timeout=3)
+        # HTTP 요청 없이 Google 서버와 TCP 연결만 맺어 한 번의 왕복으로 확인
+        socket.create_connection(('www.google.com', 443), timeout=3).close()
         return True
-    except:
+    except OSError:
         return False
 
 def get_file_size_mb(filepath):
@@ -118,100 +153,102 @@ def get_file_size_mb(filepath):
     except:
         return 0
 
+def _remove_stale_sessions(temp_base, current_dir):
+    """이전 세션이 남긴 임시 폴더를 삭제합니다. 백그라운드 스레드에서 실행됩니다."""
+    try:
+        with os.scandir(temp_base) as entries:
+            stale = [e.path for e in entries if e.path != current_dir]
+    except OSError:
+        return
+    for path in stale:
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
 def create_temp_directory():
     """임시 디렉토리를 생성합니다."""
     try:
         # 사용자 홈 디렉토리에 임시 폴더 생성 (권한 문제 방지)
         home_dir = os.path.expanduser("~")
         temp_base = os.path.join(home_dir, "speech_to_text_temp")
+        os.makedirs(temp_base, exist_ok=True)
         
-        # 기존 임시 폴더가 있다면 정리
-        if os.path.exists(temp_base):
-            try:
-                shutil.rmtree(temp_base, ignore_errors=True)
-            except:
-                pass
+        # 겹치지 않는 이름의 세션 폴더를 바로 생성
+        temp_dir = tempfile.mkdtemp(prefix=f"session_{int(time.time())}_", dir=temp_base)
         
-        # 새로운 임시 폴더 생성
-        temp_dir = os.path.join(temp_base, f"session_{int(time.time())}")
-        os.makedirs(temp_dir, exist_ok=True)
+        # 이전 세션 폴더 정리는 시작을 늦추지 않도록 백그라운드에서 수행
+        threading.Thread(target=_remove_stale_sessions, args=(temp_base, temp_dir), daemon=True).start()
         
         # exe 파일이 아닌 경우에만 출력
-        if not getattr(sys, 'frozen', False):
+        if not _FROZEN:
             print(f"[INFO] 임시 디렉토리 생성: {temp_dir}")
         return temp_dir
     except Exception as e:
         # exe 파일이 아닌 경우에만 출력
-        if not getattr(sys, 'frozen', False):
+        if not _FROZEN:
             print(f"[ERROR] 임시 디렉토리 생성 실패: {e}")
         # 대안: 시스템 임시 디렉토리 사용
         try:
             return tempfile.mkdtemp(prefix="speech_to_text_")
         except Exception as e2:
-            if not getattr(sys, 'frozen', False):
+            if not _FROZEN:
                 print(f"[ERROR] 시스템 임시 디렉토리 생성도 실패: {e2}")
             return None
 
 def cleanup_temp_files(temp_dir):
     """임시 파일들을 정리합니다."""
+    errors = []
+    
+    def collect_error(func, path, exc):
+        # 실패한 항목은 모아 두었다가 마지막에 한 번만 출력
+        if isinstance(exc, tuple):  # onerror는 sys.exc_info() 형식으로 전달
+            exc = exc[1]
+        errors.append((os.path.basename(path), exc))
+    
     try:
         if temp_dir and os.path.exists(temp_dir):
-            # 개별 파일 먼저 삭제
-            for root, dirs, files in os.walk(temp_dir, topdown=False):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        os.remove(file_path)
-                    except Exception as e:
-                        # exe 파일이 아닌 경우에만 출력
-                        if not getattr(sys, 'frozen', False):
-                            print(f"[WARNING] 파일 삭제 실패 {file}: {e}")
-                
-                for dir in dirs:
-                    try:
-                        dir_path = os.path.join(root, dir)
-                        os.rmdir(dir_path)
-                    except Exception as e:
-                        # exe 파일이 아닌 경우에만 출력
-                        if not getattr(sys, 'frozen', False):
-                            print(f"[WARNING] 디렉토리 삭제 실패 {dir}: {e}")
+            # rmtree는 os.scandir로 순회하므로 항목마다 stat을 다시 호출하지 않음
+            if sys.version_info >= (3, 12):
+                shutil.rmtree(temp_dir, onexc=collect_error)
+            else:
+                shutil.rmtree(temp_dir, onerror=collect_error)
             
-            # 최종적으로 디렉토리 삭제
-            try:
-                os.rmdir(temp_dir)
-                # exe 파일이 아닌 경우에만 출력
-                if not getattr(sys, 'frozen', False):
+            # exe 파일이 아닌 경우에만 출력
+            if not _FROZEN:
+                if errors:
+                    shown = ", ".join(f"{name}: {exc}" for name, exc in errors[:5])
+                    more = f" 외 {len(errors) - 5}개" if len(errors) > 5 else ""
+                    print(f"[WARNING] 삭제 실패 {len(errors)}개 - {shown}{more}")
+                elif not os.path.exists(temp_dir):
                     print(f"[INFO] 임시 디렉토리 정리 완료: {temp_dir}")
-            except Exception as e:
-                # exe 파일이 아닌 경우에만 출력
-                if not getattr(sys, 'frozen', False):
-                    print(f"[WARNING] 임시 디렉토리 삭제 실패: {e}")
                 
     except Exception as e:
         # exe 파일이 아닌 경우에만 출력
-        if not getattr(sys, 'frozen', False):
+        if not _FROZEN:
             print(f"[ERROR] 임시 파일 정리 실패: {e}")
 
 def format_duration(seconds):
     """초를 시:분:초 형식으로 변환합니다."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-    else:
-        return f"{minutes:02d}:{secs:02d}"
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
 
 def validate_audio_file(filepath):
     """오디오 파일의 유효성을 검사합니다."""
-    if not os.path.exists(filepath):
+    # stat 한 번으로 존재 여부, 파일 종류, 크기를 모두 확인
+    try:
+        st = os.stat(filepath)
+    except OSError:
         return False, "파일이 존재하지 않습니다."
     
-    if not os.path.isfile(filepath):
+    if not stat.S_ISREG(st.st_mode):
         return False, "유효한 파일이 아닙니다."
     
-    file_size_mb = get_file_size_mb(filepath)
+    file_size_mb = st.st_size / (1024 * 1024)
     if file_size_mb > 500:  # 500MB 제한
         return False, f"파일 크기가 너무 큽니다. (현재: {file_size_mb:.1f}MB, 최대: 500MB)"
     
@@ -7,16 +7,37 @@ import os
 import re
 import tempfile
 import threading
+import time
+import importlib.util
 from pathlib import Path
 from typing import Optional, Callable, Tuple
 
-try:
-    import yt_dlp
-except ImportError:
-    yt_dlp = None
-
 from PySide6.QtCore import QObject, Signal, QThread
 
+# YouTube URL 패턴 (watch, youtu.be, embed, v, 모바일 주소를 하나로 합쳐 한 번만 컴파일)
+_YOUTUBE_URL_RE = re.compile(
+    r'(?:https?://)?(?:www\.|m\.)?'
+    r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)'
+    r'([a-zA-Z0-9_-]+)'
+)
+
+# yt-dlp는 불러오는 데 시간이 걸리므로 처음 다운로드할 때 한 번만 불러옴
+_yt_dlp = None
+
+def _get_yt_dlp():
+    """yt-dlp 모듈을 반환합니다. 설치되어 있지 않으면 None을 반환합니다."""
+    global _yt_dlp
+    if _yt_dlp is None:
+        try:
+            import yt_dlp
+        except ImportError:
+            return None
+        _yt_dlp = yt_dlp
+    return _yt_dlp
+
+# 파일명에 사용할 수 없는 문자를 '_'로 바꾸는 변환 표
+_FILENAME_FORBIDDEN = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
 class YouTubeDownloader(QObject):
     """YouTube 비디오 다운로더 클래스"""
     
@@ -31,26 +52,18 @@ class YouTubeDownloader(QObject):
         self.url = url
         self.download_dir = download_dir
         self.downloaded_file = None
+        self._last_emit = 0.0
+        self._last_percent = -1
         
     def validate_youtube_url(self, url: str) -> Tuple[bool, str]:
         """YouTube URL 유효성 검사"""
         if not url:
             return False, "URL이 비어있습니다."
         
-        # YouTube URL 패턴
-        youtube_patterns = [
-            r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-            r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]+)',
-            r'(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]+)',
-            r'(?:https?://)?(?:www\.)?youtube\.com/v/([a-zA-Z0-9_-]+)',
-            r'(?:https?://)?(?:m\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        ]
-        
-        for pattern in youtube_patterns:
-            match = re.search(pattern, url)
-            if match:
-                video_id = match.group(1)
-                return True, f"https://www.youtube.com/watch?v={video_id}"
+        match = _YOUTUBE_URL_RE.search(url)
+        if match:
+            video_id = match.group(1)
+            return True, f"https://www.youtube.com/watch?v={video_id}"
         
         return False, "유효한 YouTube URL이 아닙니다."
     
@@ -59,6 +72,14 @@ class YouTubeDownloader(QObject):
         if d['status'] == 'downloading':
             if 'total_bytes' in d and d['total_bytes']:
                 percent = int((d['downloaded_bytes'] / d['total_bytes']) * 100)
+                
+                # 콜백이 매우 자주 호출되므로 진행률이 바뀌었을 때만, 최대 초당 10번까지 전달
+                now = time.monotonic()
+                if percent == self._last_percent or (now - self._last_emit < 0.1 and percent != 100):
+                    return
+                self._last_emit = now
+                self._last_percent = percent
+                
                 self.progress.emit(percent)
                 
                 speed = d.get('speed', 0)
@@ -70,10 +91,11 @@ class YouTubeDownloader(QObject):
                 self.status.emit(f"다운로드 중... {percent}%{speed_str}")
         elif d['status'] == 'finished':
             self.downloaded_file = d['filename']
-            self.status.emit("다운로드 완료! 오디오 추출 중...")
+            self.status.emit("다운로드 완료!")
     
     def download_audio(self):
         """YouTube에서 오디오만 다운로드"""
+        yt_dlp = _get_yt_dlp()
         if not yt_dlp:
             self.error.emit("yt-dlp 패키지가 설치되지 않았습니다. 'pip install yt-dlp'로 설치해주세요.")
             return
@@ -95,14 +117,8 @@ class YouTubeDownloader(QObject):
                 'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
                 'outtmpl': temp_filename,
                 'progress_hooks': [self.progress_hook],
-                'extractaudio': True,
-                'audioformat': 'wav',
-                'audioquality': '192',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'wav',
-                    'preferredquality': '192',
-                }],
+                # WAV 변환 후처리는 하지 않음: 재생(QMediaPlayer)과 인식(FFmpeg 디코딩) 모두
+                # m4a/webm을 그대로 읽을 수 있으므로 FFmpeg 변환 단계를 한 번 줄일 수 있음
                 'quiet': True,
                 'no_warnings': True,
             }
@@ -116,8 +132,7 @@ class YouTubeDownloader(QObject):
                 duration = info.get('duration', 0)
                 
                 # 제목에서 파일명에 사용할 수 없는 문자 제거
-                safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)
-                safe_title = safe_title[:50]  # 파일명 길이 제한
+                safe_title = title.translate(_FILENAME_FORBIDDEN)[:50]  # 파일명 길이 제한
                 
                 self.status.emit(f"제목: {title}")
                 if duration:
@@ -129,21 +144,16 @@ class YouTubeDownloader(QObject):
                 
                 # 다운로드된 파일 찾기
                 if self.downloaded_file and os.path.exists(self.downloaded_file):
-                    # 확장자를 .wav로 변경
-                    base_name = os.path.splitext(self.downloaded_file)[0]
-                    wav_file = base_name + '.wav'
-                    
-                    if os.path.exists(wav_file):
-                        self.finished.emit(wav_file)
-                    else:
-                        self.finished.emit(self.downloaded_file)
+                    self.finished.emit(self.downloaded_file)
                 else:
                     # 파일을 찾지 못한 경우, 디렉토리에서 가장 최근 파일 찾기
-                    files = [f for f in os.listdir(self.download_dir) 
-                            if f.startswith('youtube_audio_') and (f.endswith('.wav') or f.endswith('.m4a') or f.endswith('.webm'))]
+                    # scandir의 DirEntry는 이름과 stat 결과를 재사용하므로 파일당 stat 한 번으로 충분
+                    with os.scandir(self.download_dir) as entries:
+                        files = [e for e in entries
+                                 if e.name.startswith('youtube_audio_') and e.name.endswith(('.wav', '.m4a', '.webm'))]
                     if files:
-                        latest_file = max(files, key=lambda x: os.path.getctime(os.path.join(self.download_dir, x)))
-                        self.finished.emit(os.path.join(self.download_dir, latest_file))
+                        latest_file = max(files, key=lambda e: e.stat().st_ctime)
+                        self.finished.emit(latest_file.path)
                     else:
                         self.error.emit("다운로드된 파일을 찾을 수 없습니다.")
                         
@@ -180,7 +190,8 @@ class YouTubeDownloadThread(QThread):
 
 def check_yt_dlp_installed() -> bool:
     """yt-dlp가 설치되어 있는지 확인"""
-    return yt_dlp is not None
+    # 모듈을 실제로 불러오지 않고 설치 여부만 확인
+    return importlib.util.find_spec('yt_dlp') is not None
 
 
 def install_yt_dlp():